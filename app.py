@@ -1,25 +1,77 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import pdfplumber
+import orjson
+from pdfminer.high_level import extract_text
 import re
 import io
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
 import os
+import shutil
 import tempfile
-from difflib import SequenceMatcher
+import hashlib
+import threading
+from collections import Counter, defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from rapidfuzz import process, fuzz
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Hand log records to a background listener thread via a queue so request
+# threads only enqueue and return, instead of blocking on the stream
+# handler's I/O (and its lock) in the middle of a request. The listener
+# thread starts at import, so the app must be imported after fork (i.e. no
+# gunicorn --preload): threads do not survive fork(), and a worker that
+# inherits this module would enqueue records nothing ever drains.
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
+# The queue handler only merges the message args before enqueueing; the
+# full timestamped line is rendered by the listener thread.
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+_log_listener.start()
+# Drain whatever is still queued (typically the final error burst) before
+# the interpreter exits.
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+class OrJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, so every jsonify response is
+    serialized in C instead of the stdlib's Python encoder.
+    OPT_NON_STR_KEYS keeps the integer semester IDs serializable."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrJSONProvider(app)
 CORS(app)
+# Cap the request body so oversized (or hostile) uploads are rejected while
+# they are still streaming in, instead of being fully buffered and failing
+# validation afterwards. Werkzeug enforces this against Content-Length and
+# while reading the body, raising 413 early.
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024
 
 GRADE_POINTS = {"O": 10, "A+": 9, "A": 8, "B+": 7, "B": 6, "C": 5, "P": 4, "F": 0}
-ALLOWED_EXTENSIONS = {'pdf'}
+ALLOWED_EXTENSIONS = frozenset({'pdf'})
+# Uploads at or below this size are parsed straight from memory; anything
+# larger falls back to a temp file on disk.
+IN_MEMORY_UPLOAD_MAX = 50 * 1024 * 1024
+# The upload form is capped at eight semesters, so the per-semester form
+# field names can be built once at import time instead of per request.
+SEM_KEYS = [(i, f"courses_{i}", f"results_{i}") for i in range(1, 9)]
 DEPARTMENT_CODES = {
     "CV": "Civil Engineering",
     "ME": "Mechanical Engineering",
@@ -41,55 +93,156 @@ DEPARTMENT_CODES = {
     "BS": "Computer Science and Business Systems"
 }
 
+# Regex patterns compiled once at import. These all run inside per-line loops
+# on every upload, so compiling them here avoids re.compile/cache lookups in
+# the hot parsing paths.
+_SUBJECT_CODE_RE = re.compile(r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}[A-Za-z0-9]*)')
+_SUBJECT_CODE_HINT_RE = re.compile(r'\b2\d[A-Za-z]{2}\d[A-Za-z]{2,7}')
+# A grade is a single letter token (optionally with '+') at the end of the
+# line; anchoring on a word boundary keeps trailing letters of codes or
+# names (e.g. the 'A' in '...DSA') from being misread as grades.
+_GRADE_RE = re.compile(r'\b([OABCPF]\+?)\s*$', re.IGNORECASE)
+_INLINE_GRADE_RE = re.compile(r'[0-9]+\s+([OABCPF]\+?)\s*$', re.IGNORECASE)
+_NAME_STRIP_RE = re.compile(r'\s+\d+.*$')
+# Fast path for well-formed result rows: "CODE  Subject Name  <marks> GRADE"
+# on one line. Run with finditer over the whole document so the common case
+# is a single C-level scan instead of per-line dispatch.
+# The whitespace inside a row is spaces/tabs only so a match can never leak
+# across lines, and the grade group must start right after whitespace;
+# otherwise the lazy .*? half-matches the tail of markers like "AB"/"NA"
+# (or borrows the next line's grade) and fabricates passing grades for
+# absent subjects.
+_ROW_RE = re.compile(
+    r'^(?P<code>2\d[A-Za-z]{2}\d[A-Za-z]{2,7}[A-Za-z0-9]*)[ \t]+(?P<name>.+?)[ \t]+\d+.*?[ \t](?P<grade>[OABCPF]\+?)[ \t]*$',
+    re.MULTILINE
+)
+_NORMALIZED_CODE_RE = re.compile(r'(\d+)([A-Za-z]+)(\d+)([A-Za-z]+)([A-Za-z0-9]+)')
+_CORE_PARTS_RE = re.compile(r'(\d+)([A-Za-z]+)(\d+)([A-Za-z]+)')
+_GRADE_ROW_RE = re.compile(r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}[A-Za-z0-9]*)\s+(.*?)\s+\d+\s+\d+\s+\d+\s+([OABCPFo+]+)')
+_CREDIT_TAIL_RE = re.compile(r'(\d+(?:\.\d+)?)$')
+
+_COURSE_LINE_RES = [
+    re.compile(r'\d+\s+(.+?)\s+(2\d[A-Za-z0-9]{6,10})\s+\w+\s+\d+\s+(\d+(?:\.\d+)?)'),
+    re.compile(r'(.+?)\s+(2\d[A-Za-z0-9]{6,10})\s+\w+\s+\d+\s+(\d+(?:\.\d+)?)'),
+    re.compile(r'(.+?)\s+(2\d[A-Za-z0-9]{6,10})\s+.*?(\d+(?:\.\d+)?)$')
+]
+
+# Special subjects as single alternations with one named group per subject;
+# m.lastgroup identifies which subject matched, so one search per line
+# replaces the old loop over four separate patterns.
+_RESULT_SPECIAL_RE = re.compile(
+    r'(?P<bfe>2\d[A-Za-z]{2}\d[A-Za-z]{2,7}(?:BFE|FBE))\s+Biology\s+for\s+Engineers'
+    r'|(?P<env>2\d[A-Za-z]{2}\d[A-Za-z]{2,7}ENV)\s+Environmental\s+Studies'
+    r'|(?P<cph>2\d[A-Za-z]{2}\d[A-Za-z]{2,7}CPH)\s+Constitution\s+of\s+India'
+    r'|(?P<mat>2\d[A-Za-z]{2}\d[A-Za-z]{2,7}MAT)\s+Mathematics',
+    re.IGNORECASE
+)
+
+_COURSE_SPECIAL_RE = re.compile(
+    r'Biology\s+for\s+Engineers\s+(?P<bfe>2\d[A-Za-z0-9]{6,10})'
+    r'|Environmental\s+Studies\s+(?P<env>2\d[A-Za-z0-9]{6,10})'
+    r'|Constitution\s+of\s+India\s+(?P<cph>2\d[A-Za-z0-9]{6,10})'
+    r'|Mathematics\s+(?P<mat>2\d[A-Za-z0-9]{6,10})',
+    re.IGNORECASE
+)
+
+_SPECIAL_NAME_BY_GROUP = {
+    "bfe": "Biology for Engineers",
+    "env": "Environmental Studies",
+    "cph": "Constitution of India",
+    "mat": "Mathematics"
+}
+
+_SPECIAL_KEYWORDS_LOWER = (
+    "biology for engineers",
+    "environmental studies",
+    "constitution of india",
+    "mathematics"
+)
+
+_UNMATCHED_KEYWORD_RES = [
+    ("Biology", re.compile(r"BFE|FBE")),
+    ("Environment", re.compile(r"ENV")),
+    ("Constitution", re.compile(r"CPH")),
+    ("Math", re.compile(r"MAT"))
+]
+
+# Single alternation patterns so detection needs one scan of the text rather
+# than one scan per department / semester.
+_DEPT_RE = re.compile(r'\b2\d(' + '|'.join(map(re.escape, DEPARTMENT_CODES)) + r')\d')
+_SEM_RE = re.compile(r'\b2\d[A-Za-z]{2}([1-8])[A-Za-z]{2}')
+
+def _bulk_unlink(paths):
+    for file_path in paths:
+        try:
+            os.unlink(file_path)
+        except Exception as e:
+            logger.error("Error removing temporary file %s: %s", file_path, e)
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    dot = filename.rfind('.')
+    return dot >= 0 and filename[dot + 1:].lower() in ALLOWED_EXTENSIONS
 
 def extract_text_from_pdf(pdf_file):
     try:
-        text = ""
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text
+        return extract_text(pdf_file)
     except Exception as e:
-        logger.error(f"PDF extraction error: {str(e)}")
+        logger.error("PDF extraction error: %s", e)
         raise ValueError("Unable to extract text from the provided PDF")
 
+# A minimal one-page blank PDF used to warm up pdfminer at import time.
+_TINY_BLANK_PDF = (
+    b'%PDF-1.4\n'
+    b'1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n'
+    b'2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n'
+    b'3 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+    b'/Contents 4 0 R >>\nendobj\n'
+    b'4 0 obj\n<< /Length 5 >>\nstream\nBT ET\nendstream\nendobj\n'
+    b'xref\n0 5\n'
+    b'0000000000 65535 f \n0000000009 00000 n \n0000000058 00000 n \n'
+    b'0000000115 00000 n \n0000000202 00000 n \n'
+    b'trailer\n<< /Size 5 /Root 1 0 R >>\nstartxref\n256\n%%EOF'
+)
+
+def _warm_up_pdf_parser():
+    """Run one throwaway extraction so the first real request does not pay
+    pdfminer's lazy imports, font-table loads and regex compilation."""
+    try:
+        extract_text(io.BytesIO(_TINY_BLANK_PDF))
+    except Exception as e:
+        logger.warning("PDF parser warm-up failed: %s", e)
+
+_warm_up_pdf_parser()
+
 def detect_department(result_text, course_text):
     all_text = result_text + course_text
-    dept_counts = {}
-    for dept_code, dept_name in DEPARTMENT_CODES.items():
-        pattern = fr'\b2\d{dept_code}\d'
-        matches = re.findall(pattern, all_text)
-        dept_counts[dept_code] = len(matches)
-    
-    max_dept = max(dept_counts.items(), key=lambda x: x[1]) if dept_counts else (None, 0)
-    if max_dept[1] > 0:
-        return max_dept[0], DEPARTMENT_CODES.get(max_dept[0])
+    dept_counts = Counter(_DEPT_RE.findall(all_text))
+
+    top = dept_counts.most_common(1)
+    if top and top[0][1] > 0:
+        return top[0][0], DEPARTMENT_CODES.get(top[0][0])
     return None, None
 
 def detect_semester(result_text, course_text):
     all_text = result_text + course_text
-    sem_counts = {}
-    for i in range(1, 9):
-        pattern = fr'\b2\d[A-Za-z]{2}{i}[A-Za-z]{2}'
-        matches = re.findall(pattern, all_text)
-        sem_counts[i] = len(matches)
-    
-    max_sem = max(sem_counts.items(), key=lambda x: x[1]) if sem_counts else (None, 0)
-    if max_sem[1] > 0:
-        return max_sem[0]
+    sem_counts = Counter(int(sem) for sem in _SEM_RE.findall(all_text))
+
+    top = sem_counts.most_common(1)
+    if top and top[0][1] > 0:
+        return top[0][0]
     return None
 
+@lru_cache(maxsize=4096)
 def normalize_subject_code(code):
     code = code.strip().replace(" ", "")
-    match = re.search(r'(\d+)([A-Za-z]+)(\d+)([A-Za-z]+)([A-Za-z0-9]+)', code)
+    match = _NORMALIZED_CODE_RE.search(code)
     if match:
         return match.group(0)
     return code
 
+@lru_cache(maxsize=4096)
 def extract_core_code_parts(code):
-    match = re.search(r'(\d+)([A-Za-z]+)(\d+)([A-Za-z]+)', code)
+    match = _CORE_PARTS_RE.search(code)
     if match:
         year = match.group(1)
         dept = match.group(2)
@@ -100,39 +253,78 @@ def extract_core_code_parts(code):
 
 def parse_result_data(result_text):
     subjects = {}
-    subject_lines = []
+
+    # Fast path: pull complete rows out of the whole document in one scan.
+    # Anything it misses (wrapped names, grade on a following line) is
+    # picked up by the line-based passes below.
+    for m in _ROW_RE.finditer(result_text):
+        grade = m.group('grade').upper()
+        if grade == "O+":
+            grade = "O"
+        if grade in GRADE_POINTS:
+            subject_code = m.group('code')
+            subjects[subject_code] = {
+                "name": m.group('name').strip(),
+                "grade": grade,
+                "normalized_code": normalize_subject_code(subject_code)
+            }
+
     lines = result_text.split('\n')
 
+    # Classify every line in a single pass; the passes below then only touch
+    # the lines relevant to them instead of re-scanning the whole document.
+    subject_lines = []
+    grades_starts = []
+    keyword_lines = []
     for i, line in enumerate(lines):
-        if re.search(r'\b2\d[A-Za-z]{2}\d[A-Za-z]{2,7}', line):
+        if not line:
+            continue
+        # A subject code always contains a '2'; the cheap substring test
+        # keeps the regex engine out of the many lines that cannot match.
+        if '2' in line and _SUBJECT_CODE_HINT_RE.search(line):
             subject_lines.append((i, line))
-    
+        if "GRADES" in line:
+            grades_starts.append(i)
+        lowered = line.lower()
+        if any(keyword in lowered for keyword in _SPECIAL_KEYWORDS_LOWER):
+            keyword_lines.append((i, line))
+
+    subject_idx_set = {idx for idx, _ in subject_lines}
+
+    # Trailing grade token per line, computed once; the passes below index
+    # into this instead of re-running the grade regex on the same lines.
+    line_tail_grades = [
+        m.group(1).upper() if (m := _GRADE_RE.search(line)) else None
+        for line in lines
+    ]
+
     for i, (line_idx, line) in enumerate(subject_lines):
-        code_match = re.search(r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}[A-Za-z0-9]*)', line)
+        code_match = _SUBJECT_CODE_RE.search(line)
         if not code_match:
             continue
-        
+
         subject_code = code_match.group(1).strip()
+        if subject_code in subjects:
+            continue
         remaining_text = line[code_match.end():].strip()
-        subject_name = re.sub(r'\s+\d+.*$', '', remaining_text).strip()
-        
+        subject_name = _NAME_STRIP_RE.sub('', remaining_text).strip()
+
         if not subject_name or subject_name.isdigit():
-            if line_idx + 1 < len(lines) and line_idx + 1 not in [idx for idx, _ in subject_lines]:
+            if line_idx + 1 < len(lines) and line_idx + 1 not in subject_idx_set:
                 next_line = lines[line_idx + 1]
-                if not re.search(r'\b2\d[A-Za-z]{2}\d[A-Za-z]{2,7}', next_line):
+                if not _SUBJECT_CODE_HINT_RE.search(next_line):
                     subject_name = next_line.strip()
-        
-        grade_match = re.search(r'[0-9]+\s+([OABCPFo+]+)$', line)
+
+        grade_match = _INLINE_GRADE_RE.search(line)
         grade = None
         if grade_match:
             grade = grade_match.group(1).strip().upper().replace(" ", "")
         else:
             for j in range(1, 3):
                 if line_idx + j < len(lines):
-                    next_line = lines[line_idx + j]
-                    grade_match = re.search(r'([OABCPFo+]+)$', next_line)
-                    if grade_match and len(next_line) < 20:
-                        grade = grade_match.group(1).strip().upper().replace(" ", "")
+                    tail_grade = line_tail_grades[line_idx + j]
+                    if tail_grade and len(lines[line_idx + j]) < 20:
+                        grade = tail_grade
                         break
         
         if grade == "O+":
@@ -146,11 +338,11 @@ def parse_result_data(result_text):
             }
 
     # Look for grades in structured format
-    for i, line in enumerate(lines):
-        if "GRADES" in line and i < len(lines) - 1:
+    for i in grades_starts:
+        if i < len(lines) - 1:
             for j in range(i+1, min(i+20, len(lines))):
                 grade_line = lines[j]
-                full_match = re.search(r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}[A-Za-z0-9]*)\s+(.*?)\s+\d+\s+\d+\s+\d+\s+([OABCPFo+]+)', grade_line)
+                full_match = _GRADE_ROW_RE.search(grade_line)
                 if full_match:
                     subject_code = full_match.group(1).strip()
                     subject_name = full_match.group(2).strip()
@@ -164,39 +356,29 @@ def parse_result_data(result_text):
                         }
 
     # Special subjects pattern matching
-    special_subject_patterns = [
-        (r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}(?:BFE|FBE))\s+(Biology\s+for\s+Engineers)', "Biology for Engineers"),
-        (r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}ENV)\s+(Environmental\s+Studies)', "Environmental Studies"),
-        (r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}CPH)\s+(Constitution\s+of\s+India)', "Constitution of India"),
-        (r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}MAT)\s+(Mathematics)', "Mathematics")
-    ]
-    
-    for pattern, name in special_subject_patterns:
-        for line in lines:
-            special_match = re.search(pattern, line, re.IGNORECASE)
-            if special_match:
-                subject_code = special_match.group(1).strip()
-                subject_name = name
-                grade_match = re.search(r'([OABCPFo+]+)$', line)
-                if grade_match:
-                    grade = grade_match.group(1).strip().upper().replace(" ", "")
-                    if grade in GRADE_POINTS:
-                        subjects[subject_code] = {
-                            "name": subject_name,
-                            "grade": grade,
-                            "normalized_code": normalize_subject_code(subject_code)
-                        }
+    for i, line in keyword_lines:
+        special_match = _RESULT_SPECIAL_RE.search(line)
+        if special_match:
+            subject_code = special_match.group(special_match.lastgroup).strip()
+            subject_name = _SPECIAL_NAME_BY_GROUP[special_match.lastgroup]
+            grade = line_tail_grades[i]
+            if grade:
+                if grade in GRADE_POINTS:
+                    subjects[subject_code] = {
+                        "name": subject_name,
+                        "grade": grade,
+                        "normalized_code": normalize_subject_code(subject_code)
+                    }
 
     # Search for special subject keywords
-    for i, line in enumerate(lines):
+    for i, line in keyword_lines:
         for keyword in ["Biology for Engineers", "Environmental Studies", "Constitution of India"]:
             if keyword in line:
-                code_match = re.search(r'(2\d[A-Za-z]{2}\d[A-Za-z]{2,7}[A-Za-z0-9]*)', line)
+                code_match = _SUBJECT_CODE_RE.search(line)
                 if code_match:
                     subject_code = code_match.group(1).strip()
-                    grade_match = re.search(r'([OABCPFo+]+)$', line)
-                    if grade_match:
-                        grade = grade_match.group(1).strip().upper().replace(" ", "")
+                    grade = line_tail_grades[i]
+                    if grade:
                         if grade in GRADE_POINTS:
                             subjects[subject_code] = {
                                 "name": keyword,
@@ -206,10 +388,8 @@ def parse_result_data(result_text):
                     else:
                         for j in range(1, 3):
                             if i + j < len(lines):
-                                next_line = lines[i + j]
-                                grade_match = re.search(r'([OABCPFo+]+)$', next_line)
-                                if grade_match and len(next_line) < 20:
-                                    grade = grade_match.group(1).strip().upper().replace(" ", "")
+                                grade = line_tail_grades[i + j]
+                                if grade and len(lines[i + j]) < 20:
                                     if grade in GRADE_POINTS:
                                         subjects[subject_code] = {
                                             "name": keyword,
@@ -218,7 +398,7 @@ def parse_result_data(result_text):
                                         }
                                     break
 
-    logger.info(f"Parsed {len(subjects)} subjects with grades")
+    logger.info("Parsed %d subjects with grades", len(subjects))
     return subjects
 
 def parse_course_data(course_text):
@@ -237,14 +417,8 @@ def parse_course_data(course_text):
             continue
         
         if in_course_section:
-            patterns = [
-                r'\d+\s+(.+?)\s+(2\d[A-Za-z0-9]{6,10})\s+\w+\s+\d+\s+(\d+(?:\.\d+)?)',
-                r'(.+?)\s+(2\d[A-Za-z0-9]{6,10})\s+\w+\s+\d+\s+(\d+(?:\.\d+)?)',
-                r'(.+?)\s+(2\d[A-Za-z0-9]{6,10})\s+.*?(\d+(?:\.\d+)?)$'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, line)
+            for pattern in _COURSE_LINE_RES:
+                match = pattern.search(line)
                 if match:
                     subject_name = match.group(1).strip()
                     subject_code = match.group(2).strip()
@@ -258,55 +432,54 @@ def parse_course_data(course_text):
                     break
     
     # Special subject pattern matching
-    special_subject_patterns = [
-        (r'(Biology\s+for\s+Engineers)\s+(2\d[A-Za-z0-9]{6,10})', "BFE|FBE"),
-        (r'(Environmental\s+Studies)\s+(2\d[A-Za-z0-9]{6,10})', "ENV"),
-        (r'(Constitution\s+of\s+India)\s+(2\d[A-Za-z0-9]{6,10})', "CPH"),
-        (r'(Mathematics)\s+(2\d[A-Za-z0-9]{6,10})', "MAT")
-    ]
-    
-    for pattern, identifier in special_subject_patterns:
-        for line in lines:
-            special_match = re.search(pattern, line, re.IGNORECASE)
-            if special_match:
-                subject_name = special_match.group(1).strip()
-                subject_code = special_match.group(2).strip()
-                credit_match = re.search(r'(\d+(?:\.\d+)?)$', line)
-                if credit_match:
-                    credit = float(credit_match.group(1).strip())
-                    normalized_code = normalize_subject_code(subject_code)
-                    
-                    course_credits[subject_code] = credit
-                    course_credits[normalized_code] = credit
-                    subject_names[subject_code] = subject_name
-                    subject_names[normalized_code] = subject_name
-    
-    # Generate alternative department codes
-    for code in list(course_credits.keys()):
-        year, dept, sem, type_code = extract_core_code_parts(code)
-        if year and dept and sem:
-            credit = course_credits[code]
-            name = subject_names.get(code, "")
-            
-            for alt_dept in DEPARTMENT_CODES:
-                if alt_dept != dept:
-                    alt_code = code.replace(dept, alt_dept)
-                    alt_normalized = normalize_subject_code(alt_code)
-                    course_credits[alt_code] = credit
-                    course_credits[alt_normalized] = credit
-                    subject_names[alt_code] = name
-                    subject_names[alt_normalized] = name
+    for line in lines:
+        special_match = _COURSE_SPECIAL_RE.search(line)
+        if special_match:
+            subject_name = _SPECIAL_NAME_BY_GROUP[special_match.lastgroup]
+            subject_code = special_match.group(special_match.lastgroup).strip()
+            credit_match = _CREDIT_TAIL_RE.search(line)
+            if credit_match:
+                credit = float(credit_match.group(1).strip())
+                normalized_code = normalize_subject_code(subject_code)
+
+                course_credits[subject_code] = credit
+                course_credits[normalized_code] = credit
+                subject_names[subject_code] = subject_name
+                subject_names[normalized_code] = subject_name
     
     # Create subject name mapping
     subject_name_map = {}
     for code, name in subject_names.items():
         name_key = name.lower().replace(" ", "")
         subject_name_map[name_key] = code
-    
-    logger.info(f"Parsed {len(course_credits)} subjects with credits and {len(subject_names)} subject names")
-    return course_credits, subject_names, subject_name_map
 
-def find_matching_code(subject_code, course_credits, subject_names, subject_name_map, result_subject_data):
+    # Index the codes by their structural parts so the fallback matching in
+    # find_matching_code/combine_data probes a bucket instead of scanning
+    # the whole credits dict per unmatched subject.
+    course_index = {
+        "by_sem": defaultdict(list),
+        "by_year_sem": defaultdict(list),
+        "by_word": defaultdict(list),
+        "by_prefix": defaultdict(list),
+        "by_suffix": defaultdict(list)
+    }
+    for code in course_credits:
+        year, dept, sem, type_code = extract_core_code_parts(code)
+        if sem:
+            course_index["by_sem"][sem].append(code)
+            course_index["by_year_sem"][(year, sem)].append(code)
+        course_index["by_prefix"][code[:3]].append(code)
+        course_index["by_suffix"][code[-3:]].append(code)
+    for code, name in subject_names.items():
+        for word in name.lower().split():
+            bucket = course_index["by_word"][word]
+            if code not in bucket:
+                bucket.append(code)
+
+    logger.info("Parsed %d subjects with credits and %d subject names", len(course_credits), len(subject_names))
+    return course_credits, subject_names, subject_name_map, course_index
+
+def find_matching_code(subject_code, course_credits, subject_names, subject_name_map, course_index, result_subject_data):
     normalized_code = normalize_subject_code(subject_code)
     
     # Direct match with normalized code
@@ -324,7 +497,14 @@ def find_matching_code(subject_code, course_credits, subject_names, subject_name
     year, dept, sem, type_code = extract_core_code_parts(normalized_code)
     if not all([year, dept, sem, type_code]):
         return None
-    
+
+    # Try the same code under other department prefixes
+    for alt_dept in DEPARTMENT_CODES:
+        if alt_dept != dept:
+            alt_code = normalized_code.replace(dept, alt_dept)
+            if alt_code in course_credits:
+                return alt_code
+
     # Special subject matching
     special_keywords = {
         "BFE": "Biology for Engineers",
@@ -341,13 +521,12 @@ def find_matching_code(subject_code, course_credits, subject_names, subject_name
                     return code
     
     # Match by year, semester and subject name
-    for code in course_credits:
-        year2, dept2, sem2, type2 = extract_core_code_parts(code)
-        if year2 == year and sem2 == sem:
-            if result_subject_data["name"] and len(result_subject_data["name"]) > 3:
-                search_term = result_subject_data["name"].lower().split()[0]
-                if search_term in subject_names.get(code, "").lower():
-                    return code
+    if result_subject_data["name"] and len(result_subject_data["name"]) > 3:
+        search_term = result_subject_data["name"].lower().split()[0]
+        for code in course_index["by_word"].get(search_term, ()):
+            year2, dept2, sem2, type2 = extract_core_code_parts(code)
+            if year2 == year and sem2 == sem:
+                return code
     
     # Match by core pattern (year + semester + type)
     core_pattern = f"{year}{sem}{type_code[:1]}"
@@ -355,28 +534,29 @@ def find_matching_code(subject_code, course_credits, subject_names, subject_name
         if core_pattern in code:
             return code
     
-    # Fuzzy matching as last resort
-    best_match = None
-    highest_similarity = 0
-    for code in course_credits:
-        if f"{sem}" in code:
-            similarity = SequenceMatcher(None, normalized_code, code).ratio()
-            if similarity > highest_similarity:
-                highest_similarity = similarity
-                best_match = code
-    
-    if highest_similarity > 0.5:
-        return best_match
-    
+    # Fuzzy matching as last resort. Codes sharing the query's first and
+    # last three characters are by far the likeliest matches, so score that
+    # intersection first and only widen to the full semester set if empty.
+    suffix_codes = set(course_index["by_suffix"].get(normalized_code[-3:], ()))
+    candidate_codes = [
+        code for code in course_index["by_prefix"].get(normalized_code[:3], ())
+        if code in suffix_codes and sem in code
+    ]
+    if not candidate_codes:
+        candidate_codes = [code for code in course_credits if sem in code]
+    best = process.extractOne(normalized_code, candidate_codes, scorer=fuzz.ratio, score_cutoff=50)
+    if best:
+        return best[0]
+
+
     # Fall back to just semester matching
-    for code in course_credits:
-        year2, dept2, sem2, type2 = extract_core_code_parts(code)
-        if sem2 == sem:
-            return code
-    
+    sem_codes = course_index["by_sem"].get(sem)
+    if sem_codes:
+        return sem_codes[0]
+
     return None
 
-def combine_data(subjects, course_credits, subject_names, subject_name_map):
+def combine_data(subjects, course_credits, subject_names, subject_name_map, course_index):
     combined_data = {}
     unmatched_subjects = []
     
@@ -390,7 +570,7 @@ def combine_data(subjects, course_credits, subject_names, subject_name_map):
         elif normalized_code in course_credits:
             credit = course_credits[normalized_code]
         else:
-            matching_code = find_matching_code(subject_code, course_credits, subject_names, subject_name_map, subject_data)
+            matching_code = find_matching_code(subject_code, course_credits, subject_names, subject_name_map, course_index, subject_data)
             if matching_code:
                 credit = course_credits[matching_code]
                 if matching_code in subject_names:
@@ -417,19 +597,14 @@ def combine_data(subjects, course_credits, subject_names, subject_name_map):
             })
     
     if unmatched_subjects:
-        logger.info(f"Unmatched subjects: {len(unmatched_subjects)}")
+        logger.info("Unmatched subjects: %d", len(unmatched_subjects))
         for subj in unmatched_subjects:
-            logger.info(f" {subj['code']} - {subj['name']} - {subj['grade']}")
+            logger.info(" %s - %s - %s", subj['code'], subj['name'], subj['grade'])
             
             # Handle special cases
-            for keyword, pattern in [
-                ("Biology", r"BFE|FBE"),
-                ("Environment", r"ENV"),
-                ("Constitution", r"CPH"),
-                ("Math", r"MAT")
-            ]:
+            for keyword, pattern in _UNMATCHED_KEYWORD_RES:
                 if keyword in subj["name"]:
-                    matching_codes = [code for code in course_credits if re.search(pattern, code)]
+                    matching_codes = [code for code in course_credits if pattern.search(code)]
                     if matching_codes:
                         code = matching_codes[0]
                         credit = course_credits[code]
@@ -446,9 +621,9 @@ def combine_data(subjects, course_credits, subject_names, subject_name_map):
             # Try to match by semester and type
             year, dept, sem, type_code = extract_core_code_parts(subj["code"])
             if sem:
-                for code in course_credits:
+                for code in course_index["by_sem"].get(sem, ()):
                     _, _, code_sem, code_type = extract_core_code_parts(code)
-                    if code_sem == sem and (type_code == code_type or type_code[0] == code_type[0]):
+                    if type_code == code_type or type_code[0] == code_type[0]:
                         credit = course_credits[code]
                         name = subject_names.get(code, subj["name"])
                         combined_data[subj["code"]] = {
@@ -460,7 +635,7 @@ def combine_data(subjects, course_credits, subject_names, subject_name_map):
                         }
                         break
     
-    logger.info(f"Combined data for {len(combined_data)} subjects")
+    logger.info("Combined data for %d subjects", len(combined_data))
     return combined_data
 
 def calculate_sgpa(subjects):
@@ -493,44 +668,32 @@ def calculate_sgpa(subjects):
         return 0, subject_points, total_credits, weighted_sum
     
     sgpa = weighted_sum / total_credits
-    logger.info(f"Calculated SGPA: {round(sgpa, 2)} (Total credits: {total_credits}, Total points: {weighted_sum})")
+    logger.info("Calculated SGPA: %s (Total credits: %s, Total points: %s)", round(sgpa, 2), total_credits, weighted_sum)
     
     return round(sgpa, 2), subject_points, total_credits, weighted_sum
 
-def calculate_cgpa(semester_data):
-    """
-    Calculate CGPA based on multiple semesters.
-    Formula: Total points earned across all semesters / Total credits across all semesters
-    
-    Also calculates running CGPA for each semester.
-    """
+@lru_cache(maxsize=512)
+def _cgpa_from_totals(semester_totals):
+    """CGPA figures derived purely from sorted (sem_id, credits, points)
+    tuples; cacheable since identical totals always yield identical output."""
     cumulative_credits = 0
     cumulative_points = 0
     semester_cgpa = {}
-    
-    # Sort semesters by ID
-    sorted_semesters = sorted(semester_data.items(), key=lambda x: x[0])
-    
-    for sem_id, data in sorted_semesters:
-        # Add current semester credits and points to cumulative totals
-        cumulative_credits += data["total_credits"]
-        cumulative_points += data["total_points"]
-        
+
+    for sem_id, total_credits, total_points in semester_totals:
+        cumulative_credits += total_credits
+        cumulative_points += total_points
+
         # Calculate CGPA up to this semester
         if cumulative_credits > 0:
             cgpa = round(cumulative_points / cumulative_credits, 2)
         else:
             cgpa = 0
-            
-        # Store CGPA for this semester
         semester_cgpa[sem_id] = cgpa
-        
-        # Update the semester data with CGPA
-        semester_data[sem_id]["cgpa"] = cgpa
-    
+
     # Overall CGPA
     overall_cgpa = round(cumulative_points / cumulative_credits, 2) if cumulative_credits > 0 else 0
-    
+
     # Summary data
     summary = {
         "total_credits": round(cumulative_credits, 1),
@@ -538,11 +701,32 @@ def calculate_cgpa(semester_data):
         "max_possible_points": round(cumulative_credits * 10, 1),
         "overall_percentage": round((cumulative_points / (cumulative_credits * 10)) * 100, 2) if cumulative_credits > 0 else 0
     }
-    
-    logger.info(f"Calculated overall CGPA: {overall_cgpa}")
-    logger.info(f"Semester-wise CGPA: {semester_cgpa}")
-    
-    return overall_cgpa, semester_data, summary
+
+    return overall_cgpa, semester_cgpa, summary
+
+def calculate_cgpa(semester_data):
+    """
+    Calculate CGPA based on multiple semesters.
+    Formula: Total points earned across all semesters / Total credits across all semesters
+
+    Also calculates running CGPA for each semester.
+    """
+    # The CGPA maths only depends on each semester's totals, so reduce the
+    # input to a hashable key and let resubmissions hit the lru_cache.
+    semester_totals = tuple(
+        (sem_id, data["total_credits"], data["total_points"])
+        for sem_id, data in sorted(semester_data.items(), key=lambda x: x[0])
+    )
+    overall_cgpa, semester_cgpa, summary = _cgpa_from_totals(semester_totals)
+
+    # Update the semester data with the running CGPA
+    for sem_id, cgpa in semester_cgpa.items():
+        semester_data[sem_id]["cgpa"] = cgpa
+
+    logger.info("Calculated overall CGPA: %s", overall_cgpa)
+    logger.info("Semester-wise CGPA: %s", semester_cgpa)
+
+    return overall_cgpa, semester_data, dict(summary)
 
 def generate_report(subject_points, sgpa, total_credits, total_points, dept_code, dept_name, semester):
     report = {
@@ -576,12 +760,72 @@ def generate_report(subject_points, sgpa, total_credits, total_points, dept_code
     
     return report
 
+# Course catalogs are frequently re-uploaded unchanged (e.g. a user fixes
+# one result PDF and resubmits all semesters), so keep the extracted text
+# and parsed credit tables around keyed by file content.
+_COURSE_CACHE_MAX = 64
+_course_cache = OrderedDict()
+_course_cache_lock = threading.Lock()
+
+def file_digest(pdf_file):
+    """Content hash of a PDF given as a path or a file-like object."""
+    hasher = hashlib.blake2b()
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+    else:
+        pdf_file.seek(0)
+        for chunk in iter(lambda: pdf_file.read(1 << 20), b''):
+            hasher.update(chunk)
+        pdf_file.seek(0)
+    return hasher.hexdigest()
+
+def load_course_data(course_file, digest=None):
+    """Extract and parse a course PDF, reusing cached results for content
+    that has been seen before."""
+    if digest is None:
+        digest = file_digest(course_file)
+    with _course_cache_lock:
+        cached = _course_cache.get(digest)
+        if cached is not None:
+            _course_cache.move_to_end(digest)
+            logger.info("Course PDF cache hit (%s)", digest[:12])
+            return cached
+
+    course_text = extract_text_from_pdf(course_file)
+    entry = (course_text, parse_course_data(course_text))
+    with _course_cache_lock:
+        _course_cache[digest] = entry
+        while len(_course_cache) > _COURSE_CACHE_MAX:
+            _course_cache.popitem(last=False)
+    return entry
+
+# Complete semester results, keyed by the content hashes of both PDFs: a
+# byte-identical resubmission (retry, duplicate click) skips extraction and
+# parsing entirely.
+_SEMESTER_CACHE_MAX = 64
+_semester_cache = OrderedDict()
+_semester_cache_lock = threading.Lock()
+
 def process_semester_files(course_file, result_file, sem_id=None):
     """Process a single semester's course and result files"""
     try:
-        course_text = extract_text_from_pdf(course_file)
+        course_digest = file_digest(course_file)
+        result_digest = file_digest(result_file)
+        cache_key = (course_digest, result_digest)
+        with _semester_cache_lock:
+            cached = _semester_cache.get(cache_key)
+            if cached is not None:
+                _semester_cache.move_to_end(cache_key)
+                logger.info("Semester result cache hit (%s, %s)", course_digest[:12], result_digest[:12])
+                # Copy so callers can annotate the result (e.g. the CGPA
+                # fields) without tainting the cached entry.
+                return dict(cached)
+
+        course_text, parsed_course_data = load_course_data(course_file, digest=course_digest)
         result_text = extract_text_from_pdf(result_file)
-        
+
         # Detect department and semester
         dept_code, dept_name = detect_department(result_text, course_text)
         semester = detect_semester(result_text, course_text)
@@ -589,22 +833,22 @@ def process_semester_files(course_file, result_file, sem_id=None):
         if not dept_code:
             logger.warning("Could not automatically detect department")
         else:
-            logger.info(f"Detected department: {dept_code} ({dept_name})")
+            logger.info("Detected department: %s (%s)", dept_code, dept_name)
             
         if not semester:
             logger.warning("Could not automatically detect semester")
         else:
-            logger.info(f"Detected semester: {semester}")
+            logger.info("Detected semester: %s", semester)
         
         subjects_with_grades = parse_result_data(result_text)
         if not subjects_with_grades:
             raise ValueError("No subjects found in the results PDF. Please check the file.")
         
-        course_credits, subject_names, subject_name_map = parse_course_data(course_text)
+        course_credits, subject_names, subject_name_map, course_index = parsed_course_data
         if not course_credits:
             raise ValueError("No course credits found in the course PDF. Please check the file.")
-        
-        combined_data = combine_data(subjects_with_grades, course_credits, subject_names, subject_name_map)
+
+        combined_data = combine_data(subjects_with_grades, course_credits, subject_names, subject_name_map, course_index)
         if not combined_data:
             raise ValueError("Could not match any subjects between the two files. Please check that both files are for the same semester.")
         
@@ -615,21 +859,21 @@ def process_semester_files(course_file, result_file, sem_id=None):
         
         # Log detailed calculation
         logger.info("\n----- SGPA CALCULATION SUMMARY -----")
-        logger.info(f"{'SUBJECT CODE':<15} {'SUBJECT NAME':<40} {'CREDITS':<10} {'GRADE':<8} {'POINTS':<8} {'WEIGHTED':<10}")
+        logger.info("%-15s %-40s %-10s %-8s %-8s %-10s", "SUBJECT CODE", "SUBJECT NAME", "CREDITS", "GRADE", "POINTS", "WEIGHTED")
         logger.info("-" * 90)
         
         for point in subject_points:
-            logger.info(f"{point['code']:<15} {point['name']:<40} {point['credit']:<10.1f} {point['grade']:<8} {point['grade_point']:<8} {point['weighted_point']:<10.1f}")
+            logger.info("%-15s %-40s %-10.1f %-8s %-8s %-10.1f", point['code'], point['name'], point['credit'], point['grade'], point['grade_point'], point['weighted_point'])
         
         logger.info("-" * 90)
-        logger.info(f"DEPARTMENT: {dept_name if dept_name else 'Unknown'}")
-        logger.info(f"SEMESTER: {semester if semester else 'Unknown'}")
-        logger.info(f"TOTAL CREDITS: {total_credits:.1f}")
-        logger.info(f"TOTAL POINTS: {total_points:.1f}")
-        logger.info(f"SGPA: {sgpa:.2f}")
+        logger.info("DEPARTMENT: %s", dept_name if dept_name else "Unknown")
+        logger.info("SEMESTER: %s", semester if semester else "Unknown")
+        logger.info("TOTAL CREDITS: %.1f", total_credits)
+        logger.info("TOTAL POINTS: %.1f", total_points)
+        logger.info("SGPA: %.2f", sgpa)
         logger.info("-" * 90)
         
-        return {
+        sem_data = {
             "sgpa": sgpa,
             "subjects": report["subjects"],
             "total_credits": total_credits,
@@ -642,11 +886,22 @@ def process_semester_files(course_file, result_file, sem_id=None):
             },
             "semester": semester
         }
-    
+
+        with _semester_cache_lock:
+            _semester_cache[cache_key] = dict(sem_data)
+            while len(_semester_cache) > _SEMESTER_CACHE_MAX:
+                _semester_cache.popitem(last=False)
+
+        return sem_data
+
     except Exception as e:
-        logger.error(f"Error processing semester {sem_id}: {str(e)}")
+        logger.error("Error processing semester %s: %s", sem_id, e)
         raise
 
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    return jsonify({"error": "Uploaded files are too large. Total upload size must be under 64 MB."}), 413
+
 @app.route("/health", methods=["GET"])
 def health_check():
     return jsonify({"status": "healthy", "version": "3.0.0"})
@@ -667,47 +922,57 @@ def upload_files():
             if not allowed_file(file.filename):
                 return jsonify({"error": "File must be a PDF"}), 400
         
-        # Create temporary files to handle the uploaded PDFs
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as course_temp:
-            course_path = course_temp.name
-            course_pdf.save(course_path)
-        
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as result_temp:
-            result_path = result_temp.name
-            result_pdf.save(result_path)
-        
-        try:
-            # Process the files
-            semester_data = process_semester_files(course_path, result_path)
-            
-            # Prepare response
-            response = {
-                "sgpa": semester_data["sgpa"],
-                "subjects": semester_data["subjects"],
-                "summary": {
-                    "total_credits": semester_data["total_credits"],
-                    "total_points": semester_data["total_points"],
-                    "max_possible_points": semester_data["max_possible_points"],
-                    "percentage": semester_data["percentage"]
-                }
+        # Process the uploads in memory; the PDF parser accepts file-like
+        # objects, so there is no need for a temp-file round trip.
+        course_stream = io.BytesIO(course_pdf.read())
+        result_stream = io.BytesIO(result_pdf.read())
+
+        semester_data = process_semester_files(course_stream, result_stream)
+
+        # Prepare response
+        response = {
+            "sgpa": semester_data["sgpa"],
+            "subjects": semester_data["subjects"],
+            "summary": {
+                "total_credits": semester_data["total_credits"],
+                "total_points": semester_data["total_points"],
+                "max_possible_points": semester_data["max_possible_points"],
+                "percentage": semester_data["percentage"]
             }
-            
-            return jsonify(response)
-        
-        finally:
-            # Clean up temporary files
-            try:
-                os.unlink(course_path)
-                os.unlink(result_path)
-            except Exception as e:
-                logger.error(f"Error removing temporary files: {e}")
-                
+        }
+
+        return jsonify(response)
+
+
+    except HTTPException:
+        # Let Flask's error handlers (e.g. the 413 above) produce the response
+        raise
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error in upload_files: {str(e)}")
+        logger.error("Unexpected error in upload_files: %s", e)
         return jsonify({"error": "An unexpected error occurred. Please try again."}), 500
 
+def _stream_cgpa_response(overall_cgpa, semesters, summary, failed_semesters):
+    """Yield the /calculate_cgpa payload as incremental JSON chunks.
+
+    Serializing semester-by-semester lets the first bytes reach the client
+    while later semesters are still being encoded, instead of materializing
+    the whole response string before anything is flushed to the socket.
+    """
+    yield b'{"cgpa":' + orjson.dumps(overall_cgpa)
+    yield b',"semesters":{'
+    sep = b''
+    for sem_id in sorted(semesters):
+        yield sep + orjson.dumps(str(sem_id)) + b':' + orjson.dumps(semesters[sem_id])
+        sep = b','
+    yield b'},"summary":' + orjson.dumps(summary)
+    if failed_semesters:
+        yield b',"failed_semesters":' + orjson.dumps(
+            failed_semesters, option=orjson.OPT_NON_STR_KEYS
+        )
+    yield b'}'
+
 @app.route("/calculate_cgpa", methods=["POST"])
 def calculate_cgpa_route():
     """Handle multi-semester CGPA calculation"""
@@ -725,67 +990,127 @@ def calculate_cgpa_route():
         temp_files = []
         
         try:
-            # Process each semester's files
-            for sem_id in range(1, semester_count + 1):
-                course_key = f"courses_{sem_id}"
-                result_key = f"results_{sem_id}"
-                
+            # Validate every semester's files up front
+            semester_uploads = {}
+            for sem_id, course_key, result_key in SEM_KEYS[:semester_count]:
                 if course_key not in request.files or result_key not in request.files:
                     return jsonify({"error": f"Files for semester {sem_id} are missing"}), 400
-                
+
                 course_pdf = request.files[course_key]
                 result_pdf = request.files[result_key]
-                
+
                 # Validate files
                 for file in [course_pdf, result_pdf]:
                     if file.filename == '':
                         return jsonify({"error": f"No file selected for semester {sem_id}"}), 400
                     if not allowed_file(file.filename):
                         return jsonify({"error": f"File must be a PDF for semester {sem_id}"}), 400
-                
-                # Create temporary files
-                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as course_temp:
-                    course_path = course_temp.name
-                    course_pdf.save(course_path)
-                    temp_files.append(course_path)
-                
-                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as result_temp:
-                    result_path = result_temp.name
-                    result_pdf.save(result_path)
-                    temp_files.append(result_path)
-                
-                # Process semester data
+
+                semester_uploads[sem_id] = (course_pdf, result_pdf)
+
+            def save_to_temp(file_storage):
+                """Copy an upload into a temp file, kernel-side when possible.
+
+                Uploads big enough to land here were already spooled to a
+                real file by Werkzeug, so os.sendfile can copy page cache to
+                page cache without the bytes crossing user space. Streams
+                without a file descriptor fall back to chunked copying.
+                """
+                fd, path = tempfile.mkstemp(suffix='.pdf')
+                temp_files.append(path)
                 try:
-                    sem_data = process_semester_files(course_path, result_path, sem_id)
-                    semester_data[sem_id] = sem_data
-                except Exception as e:
-                    logger.error(f"Error processing semester {sem_id}: {e}")
-                    return jsonify({"error": f"Failed to process semester {sem_id}: {str(e)}"}), 400
-            
-            # Calculate overall CGPA from all semesters
+                    src_fd = file_storage.stream.fileno()
+                except (OSError, ValueError):
+                    with os.fdopen(fd, 'wb') as out:
+                        shutil.copyfileobj(file_storage.stream, out, length=1 << 20)
+                    return path
+                try:
+                    size = os.fstat(src_fd).st_size
+                    sent = 0
+                    while sent < size:
+                        sent += os.sendfile(fd, src_fd, sent, size - sent)
+                finally:
+                    os.close(fd)
+                return path
+
+            def upload_size(file_storage):
+                stream = file_storage.stream
+                stream.seek(0, os.SEEK_END)
+                size = stream.tell()
+                stream.seek(0)
+                return size
+
+            def save_and_process(sem_id, course_pdf, result_pdf):
+                """Parse one semester's uploads, in memory when they fit."""
+                streams = [
+                    io.BytesIO(file_storage.read())
+                    if upload_size(file_storage) <= IN_MEMORY_UPLOAD_MAX
+                    else save_to_temp(file_storage)
+                    for file_storage in (course_pdf, result_pdf)
+                ]
+                return process_semester_files(streams[0], streams[1], sem_id)
+
+            # Save and process all semesters in parallel; Werkzeug has fully
+            # buffered the multipart body by now, so each worker drains its
+            # own pair of uploads to disk and parses them while the other
+            # semesters do the same, instead of serialising 2N writes on the
+            # request thread before any parsing starts.
+            with ThreadPoolExecutor(max_workers=min(semester_count, os.cpu_count() or 1)) as executor:
+                futures = {
+                    executor.submit(save_and_process, sem_id, course_pdf, result_pdf): sem_id
+                    for sem_id, (course_pdf, result_pdf) in semester_uploads.items()
+                }
+                failed_semesters = {}
+                for future in as_completed(futures):
+                    sem_id = futures[future]
+                    try:
+                        semester_data[sem_id] = future.result()
+                    except Exception as e:
+                        # Build the message once and reuse it for both the
+                        # log record and the response payload.
+                        msg = f"Failed to process semester {sem_id}: {e!s}"
+                        logger.error(msg)
+                        failed_semesters[sem_id] = msg
+
+            # Only fail the request outright when no semester could be
+            # processed; otherwise return the CGPA over the successful
+            # semesters along with the per-semester failures so one bad
+            # file does not discard the rest of the batch.
+            if failed_semesters and not semester_data:
+                details = "; ".join(
+                    failed_semesters[sem_id] for sem_id in sorted(failed_semesters)
+                )
+                return jsonify({"error": details}), 400
+
+            # Calculate overall CGPA from the successfully parsed semesters
             overall_cgpa, updated_semesters, summary = calculate_cgpa(semester_data)
-            
-            # Prepare response
-            response = {
-                "cgpa": overall_cgpa,
-                "semesters": updated_semesters,
-                "summary": summary
-            }
-            
-            return jsonify(response)
+
+            # Stream the response instead of building one big JSON string;
+            # semester entries are serialized and flushed incrementally.
+            failure_messages = (
+                dict(sorted(failed_semesters.items())) if failed_semesters else None
+            )
+
+            return Response(
+                stream_with_context(_stream_cgpa_response(
+                    overall_cgpa, updated_semesters, summary, failure_messages
+                )),
+                mimetype="application/json",
+            )
             
         finally:
-            # Clean up temporary files
-            for file_path in temp_files:
-                try:
-                    os.unlink(file_path)
-                except Exception as e:
-                    logger.error(f"Error removing temporary file {file_path}: {e}")
-                    
+            # Clean up temporary files off the response path
+            if temp_files:
+                threading.Thread(target=_bulk_unlink, args=(list(temp_files),), daemon=True).start()
+
+
+    except HTTPException:
+        # Let Flask's error handlers (e.g. the 413 above) produce the response
+        raise
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        logger.error(f"Unexpected error in calculate_cgpa: {str(e)}")
+        logger.error("Unexpected error in calculate_cgpa: %s", e)
         return jsonify({"error": "An unexpected error occurred. Please try again."}), 500
 
 # if __name__ == "__main__":